@@ -19,6 +19,66 @@ def normalize(text: str) -> str:
     return '\n'.join(lines)
 
 
+def judge_texts(expected_raw: str, actual_raw: str) -> dict:
+    """Compare raw expected/actual text and return a verdict dict"""
+    expected = normalize(expected_raw)
+    actual = normalize(actual_raw)
+
+    if expected == actual:
+        return {
+            "verdict": "AC",
+            "passed": True,
+            "score": 1.0,
+            "message": "Output matches expected"
+        }
+
+    # Find first difference. Newline counts are compared first (a C-level
+    # scan with no allocation) so line-count mismatches skip the split.
+    exp_nl = expected.count('\n')
+    act_nl = actual.count('\n')
+
+    if exp_nl != act_nl:
+        message = f"Line count mismatch: expected {exp_nl + 1}, got {act_nl + 1}"
+    else:
+        exp_lines = expected.split('\n')
+        act_lines = actual.split('\n')
+        diff_line = None
+        for i, (e, a) in enumerate(zip(exp_lines, act_lines)):
+            if e != a:
+                diff_line = i + 1
+                break
+        message = f"Difference at line {diff_line}" if diff_line else "Output differs"
+
+    return {
+        "verdict": "WA",
+        "passed": False,
+        "score": 0.0,
+        "message": message
+    }
+
+
+def persistent_main():
+    """Persistent worker mode: one JSON request per stdin line, one JSON
+    response per stdout line, amortizing process startup across test cases"""
+    # Ready banner: tells the judge runner this checker really speaks the
+    # persistent protocol (a one-shot judge would print a usage error here)
+    print(json.dumps({"ready": True}), flush=True)
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        test_id = ""
+        try:
+            request = json.loads(line)
+            test_id = request.get('test_id', '')
+            result = judge_texts(request.get('expected', ''), request.get('actual', ''))
+        except Exception as e:
+            result = {"verdict": "IE", "score": 0, "message": f"Judge error: {str(e)}"}
+        # Echo test_id so the runner can verify request/response pairing
+        result["test_id"] = test_id
+        print(json.dumps(result), flush=True)
+
+
 def main():
     if len(sys.argv) < 4:
         print(json.dumps({
@@ -27,46 +87,19 @@ def main():
             "message": "Usage: exact_match.py <input> <expected> <actual> [test_id]"
         }))
         sys.exit(1)
-    
+
     input_file, expected_file, actual_file = sys.argv[1:4]
     test_id = sys.argv[4] if len(sys.argv) > 4 else "unknown"
-    
+
     try:
         with open(expected_file, 'r') as f:
-            expected = normalize(f.read())
-        
+            expected = f.read()
+
         with open(actual_file, 'r') as f:
-            actual = normalize(f.read())
-        
-        if expected == actual:
-            print(json.dumps({
-                "verdict": "AC",
-                "passed": True,
-                "score": 1.0,
-                "message": "Output matches expected"
-            }))
-        else:
-            # Find first difference
-            exp_lines = expected.split('\n')
-            act_lines = actual.split('\n')
-            
-            if len(exp_lines) != len(act_lines):
-                message = f"Line count mismatch: expected {len(exp_lines)}, got {len(act_lines)}"
-            else:
-                diff_line = None
-                for i, (e, a) in enumerate(zip(exp_lines, act_lines)):
-                    if e != a:
-                        diff_line = i + 1
-                        break
-                message = f"Difference at line {diff_line}" if diff_line else "Output differs"
-            
-            print(json.dumps({
-                "verdict": "WA",
-                "passed": False,
-                "score": 0.0,
-                "message": message
-            }))
-    
+            actual = f.read()
+
+        print(json.dumps(judge_texts(expected, actual)))
+
     except Exception as e:
         print(json.dumps({
             "verdict": "IE",
@@ -77,5 +110,8 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    if '--persistent' in sys.argv[1:]:
+        persistent_main()
+    else:
+        main()
 
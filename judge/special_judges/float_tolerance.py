@@ -15,6 +15,25 @@ import os
 ABSOLUTE_TOLERANCE = float(os.environ.get('FLOAT_ABS_TOL', '1e-9'))
 RELATIVE_TOLERANCE = float(os.environ.get('FLOAT_REL_TOL', '1e-6'))
 
+# Optional JIT path: with NumPy + Numba available, bulk comparisons run as
+# compiled machine code instead of a Python loop. Falls back gracefully.
+try:
+    import numpy as np
+    from numba import njit
+
+    @njit(cache=True)
+    def _first_bad(exp, act, abs_tol, rel_tol):
+        """Return index of first out-of-tolerance pair, or -1 if all close"""
+        for i in range(exp.size):
+            d = abs(exp[i] - act[i])
+            if d > abs_tol and (exp[i] == 0.0 or d > rel_tol * abs(exp[i])):
+                return i
+        return -1
+
+except ImportError:
+    np = None
+    _first_bad = None
+
 
 def is_close(expected: float, actual: float) -> bool:
     """Check if two floats are close enough using both tolerances"""
@@ -47,6 +66,94 @@ def parse_floats(text: str) -> list:
     return [float(t) for t in tokens]
 
 
+def first_mismatch(expected_values: list, actual_values: list) -> int:
+    """Return index of the first pair outside tolerance, or -1 if all close"""
+    if _first_bad is not None and expected_values:
+        exp = np.asarray(expected_values)
+        act = np.asarray(actual_values)
+        # NaN/Inf follow is_close's special-case rules, so only hand
+        # all-finite arrays to the JIT kernel
+        if np.isfinite(exp).all() and np.isfinite(act).all():
+            return int(_first_bad(exp, act, ABSOLUTE_TOLERANCE, RELATIVE_TOLERANCE))
+
+    for i, (exp, act) in enumerate(zip(expected_values, actual_values)):
+        if not is_close(exp, act):
+            return i
+    return -1
+
+
+def judge_texts(expected_text: str, actual_text: str) -> dict:
+    """Compare expected/actual float text and return a verdict dict"""
+    # Parse values
+    try:
+        expected_values = parse_floats(expected_text)
+    except ValueError as e:
+        return {
+            "verdict": "IE",
+            "score": 0,
+            "message": f"Cannot parse expected output: {e}"
+        }
+
+    try:
+        actual_values = parse_floats(actual_text)
+    except ValueError as e:
+        return {
+            "verdict": "WA",
+            "score": 0,
+            "message": f"Cannot parse contestant output as float: {e}"
+        }
+
+    # Check count
+    if len(expected_values) != len(actual_values):
+        return {
+            "verdict": "WA",
+            "score": 0,
+            "message": f"Expected {len(expected_values)} values, got {len(actual_values)}"
+        }
+
+    # Compare values
+    bad = first_mismatch(expected_values, actual_values)
+    if bad >= 0:
+        exp, act = expected_values[bad], actual_values[bad]
+        return {
+            "verdict": "WA",
+            "score": 0,
+            "message": f"Value {bad+1}: expected {exp}, got {act} (diff: {abs(exp-act):.2e})"
+        }
+
+    return {
+        "verdict": "AC",
+        "passed": True,
+        "score": 1.0,
+        "message": f"All {len(expected_values)} value(s) within tolerance"
+    }
+
+
+def persistent_main():
+    """Persistent worker mode: one JSON request per stdin line, one JSON
+    response per stdout line, amortizing process startup across test cases"""
+    # Ready banner: tells the judge runner this checker really speaks the
+    # persistent protocol (a one-shot judge would print a usage error here)
+    print(json.dumps({"ready": True}), flush=True)
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        test_id = ""
+        try:
+            request = json.loads(line)
+            test_id = request.get('test_id', '')
+            result = judge_texts(
+                request.get('expected', '').strip(),
+                request.get('actual', '').strip()
+            )
+        except Exception as e:
+            result = {"verdict": "IE", "score": 0, "message": f"Judge error: {str(e)}"}
+        # Echo test_id so the runner can verify request/response pairing
+        result["test_id"] = test_id
+        print(json.dumps(result), flush=True)
+
+
 def main():
     if len(sys.argv) < 4:
         print(json.dumps({
@@ -55,64 +162,19 @@ def main():
             "message": "Usage: float_tolerance.py <input> <expected> <actual> [test_id]"
         }))
         sys.exit(1)
-    
+
     input_file, expected_file, actual_file = sys.argv[1:4]
     test_id = sys.argv[4] if len(sys.argv) > 4 else "unknown"
-    
+
     try:
         with open(expected_file, 'r') as f:
             expected_text = f.read().strip()
-        
+
         with open(actual_file, 'r') as f:
             actual_text = f.read().strip()
-        
-        # Parse values
-        try:
-            expected_values = parse_floats(expected_text)
-        except ValueError as e:
-            print(json.dumps({
-                "verdict": "IE",
-                "score": 0,
-                "message": f"Cannot parse expected output: {e}"
-            }))
-            return
-        
-        try:
-            actual_values = parse_floats(actual_text)
-        except ValueError as e:
-            print(json.dumps({
-                "verdict": "WA",
-                "score": 0,
-                "message": f"Cannot parse contestant output as float: {e}"
-            }))
-            return
-        
-        # Check count
-        if len(expected_values) != len(actual_values):
-            print(json.dumps({
-                "verdict": "WA",
-                "score": 0,
-                "message": f"Expected {len(expected_values)} values, got {len(actual_values)}"
-            }))
-            return
-        
-        # Compare values
-        for i, (exp, act) in enumerate(zip(expected_values, actual_values)):
-            if not is_close(exp, act):
-                print(json.dumps({
-                    "verdict": "WA",
-                    "score": 0,
-                    "message": f"Value {i+1}: expected {exp}, got {act} (diff: {abs(exp-act):.2e})"
-                }))
-                return
-        
-        print(json.dumps({
-            "verdict": "AC",
-            "passed": True,
-            "score": 1.0,
-            "message": f"All {len(expected_values)} value(s) within tolerance"
-        }))
-    
+
+        print(json.dumps(judge_texts(expected_text, actual_text)))
+
     except Exception as e:
         print(json.dumps({
             "verdict": "IE",
@@ -123,5 +185,8 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    if '--persistent' in sys.argv[1:]:
+        persistent_main()
+    else:
+        main()
 
@@ -6,13 +6,244 @@ Awards partial credit based on the percentage of correct answers.
 Useful for problems with multiple independent sub-answers.
 """
 
+import io
 import sys
-import json
+import os
+import hashlib
+import tempfile
+from itertools import zip_longest
+
+# orjson encodes the verdict natively when available; the judge only
+# needs valid JSON, not stdlib's exact spacing. Optional dependency.
+try:
+    import orjson
+
+    def dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+
+    loads = orjson.loads
+
+except ImportError:
+    from json import dumps, loads
+
+# Optional vectorized path: NumPy compares all lines in one C loop
+# instead of a Python tuple-at-a-time iteration. Falls back gracefully.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Below this many bytes of expected output the streaming pure-Python loop
+# wins; above it the vectorized compare pays for loading both line lists.
+VECTOR_MIN_BYTES = 64 * 1024
+
+
+# Verdict cache: resubmissions often replay identical (expected, actual)
+# pairs, so a hash hit replaces the whole compare. Best-effort only —
+# any cache failure falls through to a normal judge run.
+CACHE_DIR = os.environ.get('PARTIAL_SCORE_CACHE_DIR', '/tmp/pjcache')
+CACHE_MAX_ENTRIES = 256
+
+
+def cache_key(expected_file: str, actual_file: str) -> str:
+    """Digest both files (chunked, so memory stays O(1)) into one key"""
+    h = hashlib.blake2b(digest_size=16)
+    for path in (expected_file, actual_file):
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(64 * 1024), b''):
+                h.update(chunk)
+        h.update(b'|')
+    return h.hexdigest()
+
+
+def cache_get(key: str):
+    """Return the cached verdict JSON string, or None on miss"""
+    path = os.path.join(CACHE_DIR, key + '.json')
+    try:
+        with open(path, 'r') as f:
+            payload = f.read()
+        os.utime(path)  # refresh mtime so eviction is LRU-ish
+        return payload
+    except OSError:
+        return None
+
+
+def cache_put(key: str, payload: str) -> None:
+    """Atomically store a verdict, evicting oldest entries past the cap"""
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR)
+        os.write(fd, payload.encode())
+        os.close(fd)
+        os.replace(tmp_path, os.path.join(CACHE_DIR, key + '.json'))
+
+        entries = [e for e in os.scandir(CACHE_DIR) if e.name.endswith('.json')]
+        if len(entries) > CACHE_MAX_ENTRIES:
+            entries.sort(key=lambda e: e.stat().st_mtime)
+            for entry in entries[:len(entries) - CACHE_MAX_ENTRIES]:
+                os.unlink(entry.path)
+    except OSError:
+        pass
+
+
+def iter_lines(f):
+    """Yield stripped, non-blank lines from an open file"""
+    for line in f:
+        line = line.strip()
+        if line:
+            yield line
+
+
+def compare_streaming(f_exp, f_act):
+    """Compare line-by-line in a single lockstep pass over both files.
+
+    Returns (total, actual_count, correct_count, wrong_count,
+    wrong_indices) where wrong_indices holds only the first few 1-based
+    mismatch positions.
+    """
+    total = 0
+    actual_count = 0
+    correct_count = 0
+    wrong_count = 0
+    wrong_indices = []
+
+    for i, (exp, act) in enumerate(
+        zip_longest(iter_lines(f_exp), iter_lines(f_act), fillvalue="")
+    ):
+        if exp:
+            total += 1
+        if act:
+            actual_count += 1
+        if not exp:
+            continue  # extra actual line, penalized by the caller
+        if exp == act:
+            correct_count += 1
+        else:
+            wrong_count += 1
+            # Only the first few indices are ever reported; past that,
+            # just count
+            if wrong_count <= 6:
+                wrong_indices.append(i + 1)
+
+    return total, actual_count, correct_count, wrong_count, wrong_indices
+
+
+def compare_vectorized(f_exp, f_act):
+    """Same contract as compare_streaming, but the per-line equality runs
+    as one NumPy array compare instead of interpreted tuple unpacking"""
+    expected_lines = list(iter_lines(f_exp))
+    actual_lines = list(iter_lines(f_act))
+    total = len(expected_lines)
+    actual_count = len(actual_lines)
+
+    if total == 0:
+        return 0, actual_count, 0, 0, []
+
+    if actual_count < total:
+        actual_lines.extend([""] * (total - actual_count))
+
+    exp_arr = np.asarray(expected_lines)
+    act_arr = np.asarray(actual_lines[:total])
+
+    # NumPy compares fixed-width string elements over their full padded
+    # width with no early exit. For long lines, first reject on an
+    # 8-char prefix (equal strings have equal prefixes), then confirm
+    # only the survivors — most wrong lines fail within a few bytes.
+    if exp_arr.itemsize > 64 * 4:  # '<U' itemsize is 4 bytes per char
+        candidates = exp_arr.astype('<U8') == act_arr.astype('<U8')
+        eq = np.zeros(total, dtype=bool)
+        idx = np.flatnonzero(candidates)
+        if idx.size:
+            eq[idx] = exp_arr[idx] == act_arr[idx]
+    else:
+        eq = exp_arr == act_arr
+
+    correct_count = int(eq.sum())
+    wrong = np.flatnonzero(~eq)
+    wrong_count = int(wrong.size)
+    wrong_indices = [int(i) + 1 for i in wrong[:6]]
+    return total, actual_count, correct_count, wrong_count, wrong_indices
+
+
+def build_result(total, actual_count, correct_count, wrong_count, wrong_indices) -> dict:
+    """Turn compare counts into the verdict dict"""
+    if total == 0:
+        if actual_count == 0:
+            return {
+                "verdict": "AC",
+                "score": 1.0,
+                "message": "Both empty (correct)"
+            }
+        return {
+            "verdict": "WA",
+            "score": 0,
+            "message": f"Expected empty output, got {actual_count} lines"
+        }
+
+    score = correct_count / total
+
+    # Also penalize extra lines
+    extra_lines = actual_count - total
+    if extra_lines > 0:
+        score = max(0, score - 0.1 * extra_lines)
+
+    # Determine verdict
+    if correct_count == total and extra_lines == 0:
+        verdict = "AC"
+        message = f"All {total} answers correct"
+    elif score > 0:
+        verdict = "WA"
+        if wrong_count <= 5:
+            message = f"{correct_count}/{total} correct. Wrong at: {wrong_indices}"
+        else:
+            message = f"{correct_count}/{total} correct ({score*100:.1f}%)"
+    else:
+        verdict = "WA"
+        message = "No correct answers"
+
+    return {
+        "verdict": verdict,
+        "passed": verdict == "AC",
+        "score": round(score, 4),
+        "message": message
+    }
+
+
+def judge_texts(expected_text: str, actual_text: str) -> dict:
+    """Compare in-memory expected/actual text and return a verdict dict"""
+    with io.StringIO(expected_text) as f_exp, io.StringIO(actual_text) as f_act:
+        if np is not None and len(expected_text) >= VECTOR_MIN_BYTES:
+            compare = compare_vectorized
+        else:
+            compare = compare_streaming
+        return build_result(*compare(f_exp, f_act))
+
+
+def persistent_main():
+    """Persistent worker mode: one JSON request per stdin line, one JSON
+    response per stdout line, amortizing process startup across test cases"""
+    # Ready banner: tells the judge runner this checker really speaks the
+    # persistent protocol (a one-shot judge would print a usage error here)
+    print(dumps({"ready": True}), flush=True)
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
+        test_id = ""
+        try:
+            request = loads(line)
+            test_id = request.get('test_id', '')
+            result = judge_texts(request.get('expected', ''), request.get('actual', ''))
+        except Exception as e:
+            result = {"verdict": "IE", "score": 0, "message": f"Judge error: {str(e)}"}
+        # Echo test_id so the runner can verify request/response pairing
+        result["test_id"] = test_id
+        print(dumps(result), flush=True)
 
 
 def main():
     if len(sys.argv) < 4:
-        print(json.dumps({
+        print(dumps({
             "verdict": "IE",
             "score": 0,
             "message": "Usage: partial_score.py <input> <expected> <actual> [test_id]"
@@ -23,72 +254,31 @@ def main():
     test_id = sys.argv[4] if len(sys.argv) > 4 else "unknown"
     
     try:
-        with open(expected_file, 'r') as f:
-            expected_lines = [line.strip() for line in f if line.strip()]
-        
-        with open(actual_file, 'r') as f:
-            actual_lines = [line.strip() for line in f if line.strip()]
-        
-        if len(expected_lines) == 0:
-            if len(actual_lines) == 0:
-                print(json.dumps({
-                    "verdict": "AC",
-                    "score": 1.0,
-                    "message": "Both empty (correct)"
-                }))
-            else:
-                print(json.dumps({
-                    "verdict": "WA",
-                    "score": 0,
-                    "message": f"Expected empty output, got {len(actual_lines)} lines"
-                }))
+        # Identical (expected, actual) pairs re-score straight from cache
+        key = cache_key(expected_file, actual_file)
+        cached = cache_get(key)
+        if cached is not None:
+            print(cached)
             return
-        
-        # Pad actual if shorter
-        while len(actual_lines) < len(expected_lines):
-            actual_lines.append("")
-        
-        # Count correct answers
-        correct_count = 0
-        wrong_indices = []
-        
-        for i, (exp, act) in enumerate(zip(expected_lines, actual_lines)):
-            if exp == act:
-                correct_count += 1
-            else:
-                wrong_indices.append(i + 1)
-        
-        total = len(expected_lines)
-        score = correct_count / total
-        
-        # Also penalize extra lines
-        extra_lines = len(actual_lines) - len(expected_lines)
-        if extra_lines > 0:
-            score = max(0, score - 0.1 * extra_lines)
-        
-        # Determine verdict
-        if correct_count == total and extra_lines == 0:
-            verdict = "AC"
-            message = f"All {total} answers correct"
-        elif score > 0:
-            verdict = "WA"
-            if len(wrong_indices) <= 5:
-                message = f"{correct_count}/{total} correct. Wrong at: {wrong_indices}"
+
+        # Stream both files in lockstep instead of materializing two line
+        # lists: memory stays O(1) and each file is read exactly once.
+        # Missing lines on either side compare as "" (blank lines are
+        # skipped, so "" never collides with a real answer). Large
+        # outputs switch to the NumPy batched compare when available.
+        with open(expected_file, 'r') as f_exp, open(actual_file, 'r') as f_act:
+            if np is not None and os.path.getsize(expected_file) >= VECTOR_MIN_BYTES:
+                compare = compare_vectorized
             else:
-                message = f"{correct_count}/{total} correct ({score*100:.1f}%)"
-        else:
-            verdict = "WA"
-            message = "No correct answers"
-        
-        print(json.dumps({
-            "verdict": verdict,
-            "passed": verdict == "AC",
-            "score": round(score, 4),
-            "message": message
-        }))
-    
+                compare = compare_streaming
+            result = build_result(*compare(f_exp, f_act))
+
+        payload = dumps(result)
+        print(payload)
+        cache_put(key, payload)
+
     except Exception as e:
-        print(json.dumps({
+        print(dumps({
             "verdict": "IE",
             "score": 0,
             "message": f"Judge error: {str(e)}"
@@ -97,5 +287,8 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    if '--persistent' in sys.argv[1:]:
+        persistent_main()
+    else:
+        main()
 
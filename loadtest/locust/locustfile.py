@@ -9,10 +9,13 @@ For headless mode:
            --headless -u 100 -r 10 --run-time 10m
 """
 
+import itertools
 import random
 import json
 import time
-from locust import HttpUser, task, between, events, tag
+from collections import Counter
+from locust import task, between, events, tag
+from locust.contrib.fasthttp import FastHttpUser
 from locust.runners import MasterRunner, WorkerRunner
 
 # =============================================================================
@@ -49,21 +52,60 @@ CODE_SAMPLES = {
 
 PROBLEM_IDS = ["prob_001", "prob_002", "prob_003", "prob_004", "prob_005"]
 
-# Language weights for different scenarios
+# Pre-serialized request bodies: the code/language part of every payload
+# is constant, so each sample is JSON-encoded once at import with %b
+# slots left for problemId/userId. Building a body at request time is
+# then one bytes-format instead of a json.dumps per request.
+_JSON_HEADERS = {"Content-Type": "application/json"}
+_PROBLEM_IDS_B = tuple(p.encode() for p in PROBLEM_IDS)
+
+_PAYLOAD_TEMPLATES = {}
+for _lang, _samples in CODE_SAMPLES.items():
+    _templates = []
+    for _code in _samples:
+        _t = json.dumps({
+            "code": _code,
+            "language": _lang,
+            "problemId": "@PID@",
+            "userId": "@UID@",
+        }).encode()
+        # Escape literal % in the code before adding the format slots
+        _t = _t.replace(b"%", b"%%")
+        _templates.append(_t.replace(b"@PID@", b"%b").replace(b"@UID@", b"%b"))
+    _PAYLOAD_TEMPLATES[_lang] = tuple(_templates)
+
+# Sample counts cached so selection is randrange + tuple indexing; every
+# weighted language has samples, so no fallback branch is needed
+_SAMPLE_COUNT = {_lang: len(_t) for _lang, _t in _PAYLOAD_TEMPLATES.items()}
+
+
+def build_payload(language, user_prefix=b"user", user_max=10000):
+    """Build a serialized submission body for a random code sample"""
+    templates = _PAYLOAD_TEMPLATES[language]
+    return templates[random.randrange(_SAMPLE_COUNT[language])] % (
+        random.choice(_PROBLEM_IDS_B),
+        b"%b_%d" % (user_prefix, random.randint(1, user_max)),
+    )
+
+# Language weights for different scenarios. The (langs, weights) pairs
+# are split out once at import so per-request sampling is a single
+# random.choices call instead of a cumulative-sum scan.
 MIXED_WEIGHTS = {"python": 35, "javascript": 30, "cpp": 15, "java": 15, "c": 3, "rust": 1, "go": 1}
 COMPILATION_WEIGHTS = {"cpp": 40, "c": 25, "java": 20, "rust": 10, "go": 5}
 
+_MIXED_LANGS, _MIXED_W = zip(*MIXED_WEIGHTS.items())
+_COMPILATION_LANGS, _COMPILATION_W = zip(*COMPILATION_WEIGHTS.items())
+
 
 def select_language(weights):
     """Select a random language based on weights."""
-    total = sum(weights.values())
-    r = random.uniform(0, total)
-    cumulative = 0
-    for lang, weight in weights.items():
-        cumulative += weight
-        if r <= cumulative:
-            return lang
-    return list(weights.keys())[0]
+    if weights is MIXED_WEIGHTS:
+        langs, w = _MIXED_LANGS, _MIXED_W
+    elif weights is COMPILATION_WEIGHTS:
+        langs, w = _COMPILATION_LANGS, _COMPILATION_W
+    else:
+        langs, w = zip(*weights.items())
+    return random.choices(langs, weights=w, k=1)[0]
 
 
 # =============================================================================
@@ -71,35 +113,44 @@ def select_language(weights):
 # =============================================================================
 
 class Stats:
-    """Global statistics tracker."""
-    submissions = 0
-    successes = 0
-    failures = 0
-    by_language = {}
-    by_verdict = {}
+    """Global statistics tracker.
+
+    The hot counters are itertools.count iterators: next() is a single
+    C-level increment, cheaper than a read-modify-write attribute update
+    in the per-request listener and atomic under the event loop.
+    """
+    _submissions = itertools.count(1)
+    _successes = itertools.count(1)
+    _failures = itertools.count(1)
+    by_language = Counter()
+    by_verdict = Counter()
 
 
 @events.request.add_listener
 def on_request(request_type, name, response_time, response_length, exception, **kwargs):
     """Track request statistics."""
     if name == "/api/submit":
-        Stats.submissions += 1
+        next(Stats._submissions)
         if exception is None:
-            Stats.successes += 1
+            next(Stats._successes)
         else:
-            Stats.failures += 1
+            next(Stats._failures)
 
 
 @events.test_stop.add_listener
 def on_test_stop(environment, **kwargs):
     """Print final statistics."""
+    # Counters started at 1, so the next value minus one is the total
+    submissions = next(Stats._submissions) - 1
+    successes = next(Stats._successes) - 1
+    failures = next(Stats._failures) - 1
     print("\n" + "=" * 80)
     print("FINAL STATISTICS")
     print("=" * 80)
-    print(f"Total Submissions: {Stats.submissions}")
-    print(f"Successes: {Stats.successes}")
-    print(f"Failures: {Stats.failures}")
-    print(f"Success Rate: {Stats.successes / max(Stats.submissions, 1) * 100:.2f}%")
+    print(f"Total Submissions: {submissions}")
+    print(f"Successes: {successes}")
+    print(f"Failures: {failures}")
+    print(f"Success Rate: {successes / max(submissions, 1) * 100:.2f}%")
     print("=" * 80)
 
 
@@ -107,7 +158,7 @@ def on_test_stop(environment, **kwargs):
 # User Classes
 # =============================================================================
 
-class MixedLanguageUser(HttpUser):
+class MixedLanguageUser(FastHttpUser):
     """
     User that submits code in various languages.
     Used for burst and sustained load tests.
@@ -148,18 +199,10 @@ class MixedLanguageUser(HttpUser):
     
     def _submit(self, language):
         """Submit code for a given language."""
-        code = random.choice(CODE_SAMPLES.get(language, CODE_SAMPLES["python"]))
-        
-        payload = {
-            "code": code,
-            "language": language,
-            "problemId": random.choice(PROBLEM_IDS),
-            "userId": f"user_{random.randint(1, 10000)}",
-        }
-        
         with self.client.post(
             "/api/submit",
-            json=payload,
+            data=build_payload(language),
+            headers=_JSON_HEADERS,
             catch_response=True,
             name="/api/submit"
         ) as response:
@@ -168,7 +211,7 @@ class MixedLanguageUser(HttpUser):
                     body = response.json()
                     if "submissionId" in body:
                         response.success()
-                        Stats.by_language[language] = Stats.by_language.get(language, 0) + 1
+                        Stats.by_language.update((language,))
                     else:
                         response.failure("Missing submissionId in response")
                 except json.JSONDecodeError:
@@ -177,7 +220,7 @@ class MixedLanguageUser(HttpUser):
                 response.failure(f"Status code: {response.status_code}")
 
 
-class CompilationStressUser(HttpUser):
+class CompilationStressUser(FastHttpUser):
     """
     User that only submits compiled languages (C, C++, Java, Rust, Go).
     Used for compilation stress testing.
@@ -218,18 +261,10 @@ class CompilationStressUser(HttpUser):
     
     def _submit_compiled(self, language):
         """Submit compiled language code."""
-        code = random.choice(CODE_SAMPLES.get(language, CODE_SAMPLES["cpp"]))
-        
-        payload = {
-            "code": code,
-            "language": language,
-            "problemId": random.choice(PROBLEM_IDS),
-            "userId": f"user_{random.randint(1, 10000)}",
-        }
-        
         with self.client.post(
             "/api/submit",
-            json=payload,
+            data=build_payload(language),
+            headers=_JSON_HEADERS,
             catch_response=True,
             name="/api/submit [compiled]"
         ) as response:
@@ -246,7 +281,7 @@ class CompilationStressUser(HttpUser):
                 response.failure(f"Status: {response.status_code}")
 
 
-class BurstUser(HttpUser):
+class BurstUser(FastHttpUser):
     """
     User for burst testing - minimal wait time, rapid submissions.
     """
@@ -259,18 +294,11 @@ class BurstUser(HttpUser):
     def burst_submit(self):
         """Rapid-fire submission."""
         language = select_language(MIXED_WEIGHTS)
-        code = random.choice(CODE_SAMPLES.get(language, CODE_SAMPLES["python"]))
-        
-        payload = {
-            "code": code,
-            "language": language,
-            "problemId": random.choice(PROBLEM_IDS),
-            "userId": f"burst_user_{random.randint(1, 1000)}",
-        }
-        
+
         with self.client.post(
             "/api/submit",
-            json=payload,
+            data=build_payload(language, user_prefix=b"burst_user", user_max=1000),
+            headers=_JSON_HEADERS,
             catch_response=True,
             name="/api/submit [burst]"
         ) as response:
@@ -8,16 +8,34 @@ Handles JSON file generation, test case parsing, and result aggregation.
 import json
 import sys
 import os
+import select
+import signal
+import threading
 import subprocess
 import tempfile
 import time
 import resource
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Dict, List, Any, Optional
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
 from pathlib import Path
 
+# orjson encodes the (potentially MBs-large) result blob natively,
+# several times faster than stdlib json. Optional dependency.
+try:
+    import orjson
 
-@dataclass
+    def _dumps(obj, indent=False) -> str:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        return orjson.dumps(obj, option=option).decode()
+
+except ImportError:
+    def _dumps(obj, indent=False) -> str:
+        return json.dumps(obj, indent=2 if indent else None)
+
+
+@dataclass(slots=True)
 class TestCase:
     """Single test case definition"""
     id: str
@@ -29,7 +47,7 @@ class TestCase:
     weight: float = 1.0
 
 
-@dataclass
+@dataclass(slots=True)
 class TestResult:
     """Result of a single test case execution"""
     test_id: str
@@ -44,7 +62,7 @@ class TestResult:
     stderr: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ExecutionSummary:
     """Summary of all test executions"""
     success: bool
@@ -58,6 +76,13 @@ class ExecutionSummary:
     compile_result: Optional[Dict] = None
 
 
+# Flat field tuples for dict conversion: a getattr comprehension copies
+# one level instead of asdict()'s recursive deep rebuild, which is the
+# dominant allocation cost when serializing thousand-test summaries.
+_RESULT_FIELDS = tuple(f.name for f in fields(TestResult))
+_SUMMARY_FIELDS = tuple(f.name for f in fields(ExecutionSummary))
+
+
 def write_json_file(filepath: str, **kwargs) -> None:
     """Write a JSON file with the given key-value pairs"""
     # Convert string 'true'/'false' to booleans
@@ -77,10 +102,20 @@ def write_json_file(filepath: str, **kwargs) -> None:
 
 
 def load_test_cases(test_file: str) -> List[TestCase]:
-    """Load test cases from JSON file"""
+    """Load test cases from JSON file.
+
+    Parses are memoized on (path, mtime): the same problem's tests are
+    loaded for every submission, so repeat loads in a warm worker skip
+    json.load entirely while edits to the file still bust the cache.
+    """
+    return list(_load_test_cases_cached(test_file, os.path.getmtime(test_file)))
+
+
+@lru_cache(maxsize=256)
+def _load_test_cases_cached(test_file: str, mtime: float) -> tuple:
     with open(test_file, 'r') as f:
         data = json.load(f)
-    
+
     tests = []
     if isinstance(data, list):
         # Array of test cases
@@ -96,9 +131,11 @@ def load_test_cases(test_file: str) -> List[TestCase]:
             ))
     elif isinstance(data, dict) and 'test_cases' in data:
         # Object with test_cases array
-        return load_test_cases_from_list(data['test_cases'])
-    
-    return tests
+        return tuple(load_test_cases_from_list(data['test_cases']))
+
+    # Tuple so cached entries can't be mutated by one caller and leak
+    # into the next
+    return tuple(tests)
 
 
 def load_test_cases_from_list(test_list: List[Dict]) -> List[TestCase]:
@@ -117,6 +154,263 @@ def load_test_cases_from_list(test_list: List[Dict]) -> List[TestCase]:
     return tests
 
 
+# Compiled launcher (see launcher.c): spawns, limits and reaps the child
+# in C, keeping the hot per-test path off the interpreter. Optional —
+# the pure-Python path below is used when the binary is missing.
+_LAUNCHER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'launcher')
+if not os.access(_LAUNCHER, os.X_OK):
+    _LAUNCHER = None
+
+
+def _run_via_launcher(cmd_parts, input_path, timeout_sec, memory_kb, workspace):
+    """Run one test through the compiled launcher.
+
+    Returns (stdout, stderr, exit_code, max_rss_kb, exec_ms); raises
+    OSError/ValueError if the launcher misbehaves, letting the caller's
+    generic error handling take over.
+    """
+    out_path = tempfile.mktemp(suffix='.out')
+    err_path = tempfile.mktemp(suffix='.err')
+    try:
+        argv = [
+            _LAUNCHER, out_path, err_path, input_path or '-',
+            str(timeout_sec), str(memory_kb), '--',
+        ] + cmd_parts
+        proc = subprocess.run(argv, cwd=workspace, capture_output=True)
+        info = json.loads(proc.stdout)
+        with open(out_path, 'rb') as f:
+            stdout = f.read()
+        # Only a 1000-char preview of stderr is ever reported, so don't
+        # pull a multi-MB log into memory just to throw it away
+        with open(err_path, 'rb') as f:
+            stderr = f.read(_STDERR_CAP)
+        return stdout, stderr, info['exit'], info['rss'], info['ms']
+    finally:
+        for path in (out_path, err_path):
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+
+def _wait4_deadline(process, timeout_sec):
+    """Reap the child with os.wait4 (for ru_maxrss), killing its process
+    group if the deadline passes.
+
+    Returns (exit_code, max_rss_kb). Peak memory comes straight from the
+    kernel's rusage instead of a /usr/bin/time tempfile parse; timeout
+    maps to the old 124 exit-code convention.
+    """
+    deadline = time.monotonic() + timeout_sec
+    timed_out = False
+    while True:
+        pid, status, rusage = os.wait4(process.pid, os.WNOHANG)
+        if pid != 0:
+            break
+        if time.monotonic() >= deadline:
+            timed_out = True
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except OSError:
+                process.kill()
+            _, status, rusage = os.wait4(process.pid, 0)
+            break
+        time.sleep(0.002)
+
+    # Tell Popen the child is already reaped so it doesn't wait again
+    process.returncode = os.waitstatus_to_exitcode(status)
+
+    if timed_out:
+        exit_code = 124
+    elif process.returncode < 0:
+        exit_code = 128 - process.returncode  # signal death, shell-style
+    else:
+        exit_code = process.returncode
+
+    # ru_maxrss is KB on Linux and covers the waited-for descendants
+    return exit_code, rusage.ru_maxrss
+
+
+# Persistent runner (opt-in via HARNESS_PERSISTENT=1): pure Python
+# solutions run inside one long-lived interpreter instead of paying
+# startup per test. See persistent_wrapper.py for the protocol.
+_PERSISTENT_ENABLED = os.environ.get('HARNESS_PERSISTENT') == '1'
+_WRAPPER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'persistent_wrapper.py')
+
+
+class PersistentRunner:
+    """Long-lived interpreter fed one JSON request per test case"""
+
+    def __init__(self, interpreter: str, code_file: str, memory_limit_kb: int, workspace: str):
+        def _limits():
+            os.setsid()
+            mem_bytes = memory_limit_kb * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (mem_bytes, mem_bytes))
+
+        self.proc = subprocess.Popen(
+            [interpreter, '-u', _WRAPPER, code_file],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            cwd=workspace,
+            preexec_fn=_limits,
+            text=True,
+            bufsize=1,
+        )
+        self._lock = threading.Lock()
+
+    def run(self, input_data: str, timeout_sec: float):
+        """Run one test; returns (stdout, error, timed_out).
+
+        Raises on a dead daemon so the caller can fall back to the
+        per-test spawn path.
+        """
+        with self._lock:
+            self.proc.stdin.write(json.dumps({'input': input_data}) + '\n')
+            self.proc.stdin.flush()
+            ready, _, _ = select.select([self.proc.stdout], [], [], timeout_sec)
+            if not ready:
+                # Runaway test: the daemon is wedged executing it, so it
+                # can't be reused — kill it and let later tests respawn
+                self.close()
+                return '', None, True
+            line = self.proc.stdout.readline()
+        if not line:
+            raise RuntimeError('persistent runner exited')
+        response = json.loads(line)
+        return response.get('stdout', ''), response.get('error'), False
+
+    def close(self) -> None:
+        if self.proc.poll() is None:
+            try:
+                os.killpg(self.proc.pid, signal.SIGKILL)
+            except OSError:
+                self.proc.kill()
+        self.proc.wait()
+
+
+def _maybe_persistent_runner(exec_cmd, memory_limit_kb, workspace='/workspace'):
+    """Start a persistent runner when enabled and the command is a plain
+    Python invocation; None means use the per-test spawn path"""
+    if not _PERSISTENT_ENABLED:
+        return None
+    parts = exec_cmd.split()
+    if len(parts) == 2 and parts[0] in ('python', 'python3') and parts[1].endswith('.py'):
+        try:
+            return PersistentRunner(parts[0], parts[1], memory_limit_kb, workspace)
+        except OSError:
+            return None
+    return None
+
+
+def _run_persistent_test(runner, test_case, timeout_sec) -> TestResult:
+    """Judge one test through the persistent runner (no per-test rusage,
+    so memory is reported as 0; limits are enforced on the daemon)"""
+    actual_timeout = test_case.time_limit_ms / 1000 if test_case.time_limit_ms else timeout_sec
+
+    start_time = time.time()
+    stdout_text, error_msg, timed_out = runner.run(test_case.input, actual_timeout)
+    execution_time_ms = int((time.time() - start_time) * 1000)
+
+    actual_bytes = stdout_text.encode('utf-8').strip()
+
+    status = 'passed'
+    error = None
+    if timed_out:
+        status = 'timeout'
+        error = f'Execution timeout ({actual_timeout}s exceeded)'
+    elif error_msg:
+        status = 'runtime_error'
+        error = error_msg
+
+    expected_bytes = test_case.expected_output.strip().encode('utf-8')
+    passed = (
+        (status == 'passed' or status == 'runtime_error')
+        and len(actual_bytes) == len(expected_bytes)
+        and actual_bytes == expected_bytes
+    )
+
+    if status == 'passed' and not passed:
+        status = 'wrong_answer'
+    elif passed:
+        status = 'passed'
+
+    return TestResult(
+        test_id=test_case.id,
+        passed=passed,
+        input=test_case.input[:1000] if not test_case.hidden else '[hidden]',
+        expected_output=test_case.expected_output[:1000] if not test_case.hidden else '[hidden]',
+        actual_output=actual_bytes[:1000].decode('utf-8', errors='replace') if not test_case.hidden else '[hidden]',
+        execution_time_ms=execution_time_ms,
+        memory_used_kb=0,
+        status=status,
+        error=error,
+        stderr=None,
+    )
+
+
+# Inputs up to this size are piped to the child's stdin instead of going
+# through a tempfile; comfortably under the 64KB pipe buffer so the
+# single write below cannot block
+_STDIN_PIPE_MAX = 32 * 1024
+
+# stderr is only ever surfaced as a short preview (500 chars in error
+# messages, 1000 in the result), so reads from the stderr file stop here
+_STDERR_CAP = 4096
+
+
+def _run_with_file_output(cmd_parts, input_path, timeout_sec, workspace, child_limits,
+                          input_bytes=None):
+    """Pure-Python spawn path: child stdout/stderr go straight to temp
+    files instead of pipes, so verbose programs never block on pipe
+    backpressure and the harness doesn't buffer output it hasn't read.
+
+    Small inputs arrive as input_bytes and are piped in; larger ones
+    come via input_path. Returns (stdout, stderr, exit_code,
+    max_rss_kb); stderr is capped since only a short preview of it is
+    ever reported.
+    """
+    out_path = tempfile.mktemp(suffix='.out')
+    err_path = tempfile.mktemp(suffix='.err')
+    out_fd = os.open(out_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    err_fd = os.open(err_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        if input_bytes is not None:
+            stdin = subprocess.PIPE
+        elif input_path:
+            stdin = open(input_path, 'r')
+        else:
+            stdin = subprocess.DEVNULL
+        process = subprocess.Popen(
+            cmd_parts,
+            stdin=stdin,
+            stdout=out_fd,
+            stderr=err_fd,
+            cwd=workspace,
+            preexec_fn=child_limits,
+        )
+        if input_bytes is not None:
+            try:
+                process.stdin.write(input_bytes)
+            except BrokenPipeError:
+                pass  # child exited without reading; its status tells the story
+            process.stdin.close()
+        exit_code, max_rss_kb = _wait4_deadline(process, timeout_sec)
+        with open(out_path, 'rb') as f:
+            stdout = f.read()
+        with open(err_path, 'rb') as f:
+            stderr = f.read(_STDERR_CAP)
+        return stdout, stderr, exit_code, max_rss_kb
+    finally:
+        os.close(out_fd)
+        os.close(err_fd)
+        for path in (out_path, err_path):
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+
 def run_single_test(
     exec_cmd: str,
     test_case: TestCase,
@@ -131,44 +425,56 @@ def run_single_test(
     actual_memory = test_case.memory_limit_kb or memory_limit_kb
     
     # Create temporary file for input
+    # Small inputs go straight down a stdin pipe (they fit in the 64KB
+    # kernel pipe buffer, so one write never blocks) and skip the
+    # write/close/unlink tempfile round-trip; the launcher path and
+    # large inputs still use a file.
     input_file = None
+    input_bytes = None
     if test_case.input:
-        input_file = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt')
-        input_file.write(test_case.input)
-        input_file.close()
-    
-    # Construct command with limits
-    time_output_file = tempfile.mktemp(suffix='.time')
-    
-    # Build command with timeout and resource limits
-    cmd_parts = [
-        '/usr/bin/time', '-v', '-o', time_output_file,
-        'timeout', '--signal=KILL', f'{actual_timeout}s',
-        'prlimit', f'--as={actual_memory * 1024}', f'--cpu={int(actual_timeout) + 1}',
-    ]
-    cmd_parts.extend(exec_cmd.split())
+        if _LAUNCHER is None and len(test_case.input) <= _STDIN_PIPE_MAX:
+            input_bytes = test_case.input.encode('utf-8')
+        else:
+            input_file = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt')
+            input_file.write(test_case.input)
+            input_file.close()
     
+    # Apply limits in the child itself instead of chaining the timeout
+    # and prlimit helpers: the target is exec'd directly with no extra
+    # fork+execs. SIGALRM/SIGXCPU are left at their defaults, so hitting
+    # a limit kills the child.
+    def _child_limits():
+        os.setsid()
+        mem_bytes = actual_memory * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (mem_bytes, mem_bytes))
+        cpu_sec = int(actual_timeout) + 1
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_sec, cpu_sec))
+        signal.setitimer(signal.ITIMER_REAL, actual_timeout)
+
+    cmd_parts = exec_cmd.split()
+
     start_time = time.time()
-    
+    exec_ms = None
+
     try:
-        # Run the command
-        process = subprocess.Popen(
-            cmd_parts,
-            stdin=open(input_file.name, 'r') if input_file else subprocess.DEVNULL,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            cwd=workspace,
-            preexec_fn=os.setsid,
-        )
-        
-        stdout, stderr = process.communicate(timeout=actual_timeout + 5)
-        exit_code = process.returncode
-        
-    except subprocess.TimeoutExpired:
-        process.kill()
-        stdout, stderr = process.communicate()
-        exit_code = 124  # Timeout exit code
-        
+        if _LAUNCHER is not None:
+            stdout, stderr, exit_code, memory_used_kb, exec_ms = _run_via_launcher(
+                cmd_parts,
+                input_file.name if input_file else None,
+                actual_timeout,
+                actual_memory,
+                workspace,
+            )
+        else:
+            stdout, stderr, exit_code, memory_used_kb = _run_with_file_output(
+                cmd_parts,
+                input_file.name if input_file else None,
+                actual_timeout + 5,
+                workspace,
+                _child_limits,
+                input_bytes=input_bytes,
+            )
+
     except Exception as e:
         return TestResult(
             test_id=test_case.id,
@@ -190,34 +496,21 @@ def run_single_test(
             except:
                 pass
     
-    execution_time_ms = int((time.time() - start_time) * 1000)
-    
-    # Parse time output for memory usage
-    memory_used_kb = 0
-    try:
-        with open(time_output_file, 'r') as f:
-            time_output = f.read()
-            for line in time_output.split('\n'):
-                if 'Maximum resident set size' in line:
-                    memory_used_kb = int(line.split()[-1])
-                    break
-    except:
-        pass
-    finally:
-        try:
-            os.unlink(time_output_file)
-        except:
-            pass
-    
-    # Decode output
-    actual_output = stdout.decode('utf-8', errors='replace').strip()
-    stderr_output = stderr.decode('utf-8', errors='replace').strip()
+    execution_time_ms = exec_ms if exec_ms is not None else int((time.time() - start_time) * 1000)
+
+    # Keep the full output as bytes: the compare below is then a straight
+    # memcmp with no UTF-8 validation pass, and only the short previews
+    # ever get decoded
+    actual_bytes = stdout.strip()
+    stderr_output = stderr[:1000].decode('utf-8', errors='replace').strip()
     
     # Determine status
     status = 'passed'
     error = None
     
-    if exit_code == 124 or exit_code == 137:
+    # 124/137: harness-side kill; 142/152: child killed by the ITIMER_REAL
+    # alarm or the RLIMIT_CPU ceiling set in _child_limits
+    if exit_code in (124, 137, 142, 152):
         status = 'timeout'
         error = f'Execution timeout ({actual_timeout}s exceeded)'
     elif exit_code == 139:
@@ -229,10 +522,13 @@ def run_single_test(
         if stderr_output:
             error += f': {stderr_output[:500]}'
     
-    # Compare output
-    expected = test_case.expected_output.strip()
-    actual = actual_output.strip()
-    passed = (status == 'passed' or status == 'runtime_error') and actual == expected
+    # Compare output (length check first rejects most mismatches for free)
+    expected_bytes = test_case.expected_output.strip().encode('utf-8')
+    passed = (
+        (status == 'passed' or status == 'runtime_error')
+        and len(actual_bytes) == len(expected_bytes)
+        and actual_bytes == expected_bytes
+    )
     
     if status == 'passed' and not passed:
         status = 'wrong_answer'
@@ -244,7 +540,7 @@ def run_single_test(
         passed=passed,
         input=test_case.input[:1000] if not test_case.hidden else '[hidden]',
         expected_output=test_case.expected_output[:1000] if not test_case.hidden else '[hidden]',
-        actual_output=actual_output[:1000] if not test_case.hidden else '[hidden]',
+        actual_output=actual_bytes[:1000].decode('utf-8', errors='replace') if not test_case.hidden else '[hidden]',
         execution_time_ms=execution_time_ms,
         memory_used_kb=memory_used_kb,
         status=status,
@@ -259,25 +555,43 @@ def run_all_tests(
     output_dir: str,
     timeout_sec: int,
     memory_limit_kb: int,
+    serial: bool = False,
 ) -> ExecutionSummary:
-    """Run all test cases and generate summary"""
-    
-    results: List[TestResult] = []
-    total_time = 0
-    max_memory = 0
-    
-    for i, test_case in enumerate(test_cases):
-        print(f'[harness] Running test {i+1}/{len(test_cases)}: {test_case.id}', file=sys.stderr)
-        
-        result = run_single_test(exec_cmd, test_case, timeout_sec, memory_limit_kb)
-        results.append(result)
-        
-        total_time += result.execution_time_ms
-        max_memory = max(max_memory, result.memory_used_kb)
-        
-        # Stop on first non-timeout failure if test case specifies
-        # (You could add a 'stop_on_failure' field to TestCase)
-    
+    """Run all test cases and generate summary.
+
+    Test cases are independent, so they fan out over a thread pool by
+    default (the workers spend their time blocked in subprocess waits);
+    pass serial=True for problems that need strict ordering.
+    """
+
+    total = len(test_cases)
+    runner = _maybe_persistent_runner(exec_cmd, memory_limit_kb)
+
+    def _run(indexed) -> TestResult:
+        i, test_case = indexed
+        print(f'[harness] Running test {i+1}/{total}: {test_case.id}', file=sys.stderr)
+        if runner is not None:
+            try:
+                return _run_persistent_test(runner, test_case, timeout_sec)
+            except Exception:
+                pass  # daemon died; this and later tests spawn normally
+        return run_single_test(exec_cmd, test_case, timeout_sec, memory_limit_kb)
+
+    try:
+        if serial or total <= 1:
+            results = [_run(item) for item in enumerate(test_cases)]
+        else:
+            max_workers = min(total, os.cpu_count() or 1)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                # executor.map preserves input order
+                results = list(executor.map(_run, enumerate(test_cases)))
+    finally:
+        if runner is not None:
+            runner.close()
+
+    total_time = sum(r.execution_time_ms for r in results)
+    max_memory = max((r.memory_used_kb for r in results), default=0)
+
     passed_count = sum(1 for r in results if r.passed)
     failed_count = len(results) - passed_count
     
@@ -296,7 +610,7 @@ def run_all_tests(
         total_time_ms=total_time,
         max_memory_kb=max_memory,
         score=round(score, 2),
-        test_results=[asdict(r) for r in results],
+        test_results=[{k: getattr(r, k) for k in _RESULT_FIELDS} for r in results],
     )
     
     return summary
@@ -330,21 +644,23 @@ def main():
         output_dir = sys.argv[4]
         timeout_sec = int(sys.argv[5])
         memory_limit_kb = int(sys.argv[6])
-        
+        serial = '--serial' in sys.argv[7:]
+
         # Load test cases
         test_cases = load_test_cases(test_file)
         print(f'[harness] Loaded {len(test_cases)} test cases', file=sys.stderr)
-        
+
         # Run tests
-        summary = run_all_tests(exec_cmd, test_cases, output_dir, timeout_sec, memory_limit_kb)
+        summary = run_all_tests(exec_cmd, test_cases, output_dir, timeout_sec, memory_limit_kb, serial=serial)
         
         # Write results
+        summary_dict = {k: getattr(summary, k) for k in _SUMMARY_FIELDS}
         result_file = os.path.join(output_dir, 'result.json')
         with open(result_file, 'w') as f:
-            json.dump(asdict(summary), f, indent=2)
-        
+            f.write(_dumps(summary_dict, indent=True))
+
         # Output summary to stdout for container to capture
-        print(json.dumps(asdict(summary)))
+        print(_dumps(summary_dict))
         
     else:
         print(f'Unknown command: {command}', file=sys.stderr)
@@ -0,0 +1,130 @@
+/* launcher.c - per-test process launcher for the execution harness.
+ *
+ * Usage:
+ *   launcher <stdout_file> <stderr_file> <input_file|-> <timeout_sec> <memory_kb> -- cmd [args...]
+ *
+ * Redirects stdio, sets RLIMIT_AS / RLIMIT_CPU and an ITIMER_REAL alarm
+ * in the child, exec's the target, reaps it with wait4 and prints a
+ * single JSON metrics line to stdout:
+ *
+ *   {"exit":N,"ms":M,"rss":K}
+ *
+ * Signal deaths map to 128+signo like a shell. This keeps the hot
+ * per-test spawn/wait path off Python entirely; json_helper.py falls
+ * back to its pure-Python path when this binary is missing.
+ *
+ * Build: gcc -O2 -o launcher launcher.c
+ */
+#define _GNU_SOURCE
+#include <errno.h>
+#include <fcntl.h>
+#include <signal.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <sys/resource.h>
+#include <sys/time.h>
+#include <sys/types.h>
+#include <sys/wait.h>
+#include <unistd.h>
+
+static pid_t child_pid = -1;
+
+/* Kill-of-last-resort if the child ignores its own alarm */
+static void on_alarm(int sig)
+{
+    (void)sig;
+    if (child_pid > 0)
+        kill(-child_pid, SIGKILL);
+}
+
+static long long now_ms(void)
+{
+    struct timeval tv;
+    gettimeofday(&tv, NULL);
+    return (long long)tv.tv_sec * 1000 + tv.tv_usec / 1000;
+}
+
+int main(int argc, char **argv)
+{
+    if (argc < 8 || strcmp(argv[6], "--") != 0) {
+        fprintf(stderr,
+                "usage: launcher <stdout_file> <stderr_file> <input_file|->"
+                " <timeout_sec> <memory_kb> -- cmd [args...]\n");
+        return 2;
+    }
+
+    const char *out_path = argv[1];
+    const char *err_path = argv[2];
+    const char *in_path = argv[3];
+    double timeout_sec = atof(argv[4]);
+    long memory_kb = atol(argv[5]);
+    char **cmd = &argv[7];
+
+    long long start = now_ms();
+
+    child_pid = fork();
+    if (child_pid < 0) {
+        perror("fork");
+        return 2;
+    }
+
+    if (child_pid == 0) {
+        struct rlimit rl;
+        struct itimerval it;
+        int in_fd, out_fd, err_fd;
+
+        setsid();
+
+        rl.rlim_cur = rl.rlim_max = (rlim_t)memory_kb * 1024;
+        setrlimit(RLIMIT_AS, &rl);
+        rl.rlim_cur = rl.rlim_max = (rlim_t)timeout_sec + 1;
+        setrlimit(RLIMIT_CPU, &rl);
+
+        in_fd = open(strcmp(in_path, "-") ? in_path : "/dev/null", O_RDONLY);
+        out_fd = open(out_path, O_WRONLY | O_CREAT | O_TRUNC, 0600);
+        err_fd = open(err_path, O_WRONLY | O_CREAT | O_TRUNC, 0600);
+        if (in_fd < 0 || out_fd < 0 || err_fd < 0)
+            _exit(126);
+        dup2(in_fd, 0);
+        dup2(out_fd, 1);
+        dup2(err_fd, 2);
+        if (in_fd > 2)
+            close(in_fd);
+        if (out_fd > 2)
+            close(out_fd);
+        if (err_fd > 2)
+            close(err_fd);
+
+        it.it_interval.tv_sec = 0;
+        it.it_interval.tv_usec = 0;
+        it.it_value.tv_sec = (time_t)timeout_sec;
+        it.it_value.tv_usec =
+            (suseconds_t)((timeout_sec - (time_t)timeout_sec) * 1e6);
+        setitimer(ITIMER_REAL, &it, NULL);
+
+        execvp(cmd[0], cmd);
+        _exit(127);
+    }
+
+    signal(SIGALRM, on_alarm);
+    alarm((unsigned)timeout_sec + 5);
+
+    int status = 0;
+    struct rusage ru;
+    while (wait4(child_pid, &status, 0, &ru) < 0) {
+        if (errno != EINTR) {
+            perror("wait4");
+            return 2;
+        }
+    }
+
+    long long elapsed = now_ms() - start;
+    int exit_code = WIFSIGNALED(status) ? 128 + WTERMSIG(status)
+                                        : WEXITSTATUS(status);
+
+    /* ru_maxrss is KB on Linux */
+    printf("{\"exit\":%d,\"ms\":%lld,\"rss\":%ld}\n",
+           exit_code, elapsed, ru.ru_maxrss);
+    return 0;
+}
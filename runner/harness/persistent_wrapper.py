@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Persistent Python Test Runner
+
+Runs the same solution file repeatedly in one interpreter, so a suite
+of N tests pays interpreter startup once instead of N times.
+json_helper.py starts this when HARNESS_PERSISTENT=1 and writes one
+JSON request per stdin line:
+
+    {"input": "<test input>"}
+
+Each request executes the solution with fresh globals, stdin fed from
+the request and stdout captured, and is answered with one JSON line:
+
+    {"stdout": "<captured output>", "error": null | "<message>"}
+"""
+
+import io
+import json
+import sys
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(json.dumps({"stdout": "", "error": "Usage: persistent_wrapper.py <code_file>"}), flush=True)
+        sys.exit(1)
+
+    code_file = sys.argv[1]
+    try:
+        with open(code_file, 'r') as f:
+            code = compile(f.read(), code_file, 'exec')
+    except (OSError, SyntaxError) as e:
+        print(json.dumps({"stdout": "", "error": f"{type(e).__name__}: {e}"}), flush=True)
+        sys.exit(1)
+
+    real_stdin = sys.stdin
+    real_stdout = sys.stdout
+
+    for line in real_stdin:
+        line = line.strip()
+        if not line:
+            continue
+        request = json.loads(line)
+
+        sys.stdin = io.StringIO(request.get('input', ''))
+        sys.stdout = io.StringIO()
+        error = None
+        try:
+            # Fresh globals per test so state can't leak between cases
+            exec(code, {'__name__': '__main__'})
+        except SystemExit:
+            pass
+        except BaseException as e:
+            error = f"{type(e).__name__}: {e}"
+        captured = sys.stdout.getvalue()
+        sys.stdin = real_stdin
+        sys.stdout = real_stdout
+
+        print(json.dumps({"stdout": captured, "error": error}), flush=True)
+
+
+if __name__ == '__main__':
+    main()
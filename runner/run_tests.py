@@ -10,14 +10,25 @@ Usage: python3 run_tests.py <workspace> <code_file> <language> <timeout_sec> <me
 
 import json
 import os
+import select
+import selectors
+import shutil
 import subprocess
 import sys
-import time
 import tempfile
+import time
 import resource
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 
+# orjson parses large test-case files a few times faster than stdlib
+# json and skips re-decoding ASCII payloads. Optional dependency.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Language to command mapping
 LANGUAGE_COMMANDS = {
     'javascript': lambda f: ['node', f],
@@ -33,6 +44,322 @@ LANGUAGE_COMMANDS = {
 }
 
 
+# prlimit(1) applies the same rlimits set_resource_limits() would, but
+# from the command line — so Popen runs without preexec_fn, which keeps
+# CPython on its vfork-based fast spawn path (any preexec_fn forces a
+# full fork plus COW page-table setup in the parent).
+_PRLIMIT = shutil.which('prlimit')
+
+# Capability probes, resolved once at import. The old code ran
+# `unshare --help` in a throwaway child for every test just to learn a
+# boolean that never changes.
+_HAS_UNSHARE = shutil.which('unshare') is not None
+_TIMEOUT_BIN = shutil.which('timeout')
+_HAS_TIMEOUT = _TIMEOUT_BIN is not None
+_HAS_TIME_BIN = os.path.exists('/usr/bin/time')
+
+# Inputs at or above this size are handed to the child as a memfd on
+# fd 0: one write into an mmap-backed file, no chunked pipe pumping
+# from the drain loop. Small inputs keep the pipe (one write anyway).
+MEMFD_MIN_BYTES = 4096
+_HAS_MEMFD = hasattr(os, 'memfd_create')
+
+# Redirected stdio temp files live in tmpfs when available, so child
+# output is written to page cache and never queued for disk
+_SHM_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+
+def make_stdin_fd(input_bytes: bytes) -> int:
+    """Stage input in a memfd positioned at offset 0, ready to be fd 0."""
+    fd = os.memfd_create('stdin')
+    os.write(fd, input_bytes)
+    os.lseek(fd, 0, os.SEEK_SET)
+    return fd
+
+
+# timeMs reports the child's CPU time (ru_utime + ru_stime) from the
+# reaping wait4 by default: no timer syscalls around the spawn, and the
+# number is stable when the box is loaded. Set RUN_TESTS_WALL_CLOCK=1
+# to report elapsed wall time instead.
+_WALL_CLOCK = os.environ.get('RUN_TESTS_WALL_CLOCK') == '1'
+
+
+def elapsed_ms(start_time: float, rusage, timed_out: bool = False) -> int:
+    """Test duration in ms: CPU time from rusage, or wall when flagged.
+
+    A timed-out child dies by signal before accumulating meaningful CPU
+    time (a blocked or mid-kill process can report near-zero), so TLE
+    results always fall back to the wall-clock measurement.
+    """
+    if _WALL_CLOCK or rusage is None or timed_out:
+        return int((time.perf_counter() - start_time) * 1000)
+    return int((rusage.ru_utime + rusage.ru_stime) * 1000)
+
+
+# Pipe read caps, matching the display truncation limits. The stdout
+# cap is raised per test when the expected output is itself larger, so
+# correct-but-verbose answers still compare in full.
+STDOUT_CAP = 100000
+STDERR_CAP = 10000
+
+
+def output_matches(stdout: bytes, expected_output: str) -> bool:
+    """Compare stripped actual output against the expected output.
+
+    Length differences exit immediately; equal lengths fall through to
+    a direct bytes compare (a single memcmp).
+    """
+    actual = stdout.strip()
+    expected = expected_output.strip().encode('utf-8')
+    if len(actual) != len(expected):
+        return False
+    return actual == expected
+
+
+# Invariant argv prefixes, frozen once per run by
+# install_command_prefixes: the timeout/prlimit/unshare arguments never
+# change between tests, so the hot paths splice cached tuples instead
+# of rebuilding and re-interpolating the same strings per spawn.
+_timeout_prefix: tuple = ()
+_unshare_prefix: tuple = ()
+_prlimit_prefix: tuple = ()
+
+
+def install_command_prefixes(timeout_sec: int, memory_kb: int):
+    """Precompute the constant wrapper-argv pieces for this run."""
+    global _timeout_prefix, _unshare_prefix, _prlimit_prefix
+    if _HAS_TIMEOUT:
+        _timeout_prefix = (_TIMEOUT_BIN, '--signal=KILL', f'{timeout_sec}s')
+    if _HAS_UNSHARE:
+        _unshare_prefix = ('unshare', '-n')
+    if _PRLIMIT:
+        memory_bytes = memory_kb * 1024
+        # prlimit applies the same rlimits set_resource_limits() would
+        _prlimit_prefix = (
+            _PRLIMIT,
+            f'--cpu={timeout_sec}:{timeout_sec + 1}',
+            f'--as={memory_bytes}',
+            '--nproc=50',
+            '--nofile=64',
+            '--core=0',
+            '--',
+        )
+
+
+def compiled_fast_eligible(command: List[str]) -> bool:
+    """Fast path applies to direct binary invocations (c/cpp/go/rust),
+    and needs timeout(1) for the deadline and prlimit(1) for rlimits."""
+    return (
+        bool(_timeout_prefix)
+        and bool(_prlimit_prefix)
+        and command[0].startswith('./')
+    )
+
+
+def run_compiled_fast(
+    workspace: str,
+    command: List[str],
+    input_data: str,
+    expected_output: str,
+    test_id: str,
+    timeout_sec: int,
+    memory_kb: int,
+) -> Dict[str, Any]:
+    """Run a compiled-language test via posix_spawn + wait4.
+
+    glibc implements posix_spawn with clone(CLONE_VM|CLONE_VFORK), so
+    the child borrows the runner's page tables until exec instead of
+    copying them — the dominant fork cost for a large parent. stdio is
+    wired to temp files through spawn file actions, so there is no pipe
+    to pump and no event loop; the parent just blocks in wait4, which
+    also returns the child's rusage. Deadline and rlimits come from the
+    timeout/prlimit prefix since posix_spawn has no pre-exec hook.
+    """
+    result = {
+        'testId': test_id,
+        'passed': False,
+        'exitCode': -1,
+        'timeMs': 0,
+        'memoryKb': 0,
+        'timeoutOccurred': False,
+        'memoryExceeded': False,
+        'stdout': '',
+        'stderr': '',
+        'expectedOutput': expected_output,
+    }
+
+    # posix_spawn does not chdir, so resolve the binary against the
+    # workspace explicitly
+    resolved = list(command)
+    resolved[0] = os.path.join(workspace, resolved[0])
+    argv = [*_timeout_prefix, *_prlimit_prefix, *resolved]
+
+    stdout = b''
+    start_time = time.perf_counter()
+    with tempfile.TemporaryFile(dir=_SHM_DIR) as f_in, \
+            tempfile.TemporaryFile(dir=_SHM_DIR) as f_out, \
+            tempfile.TemporaryFile(dir=_SHM_DIR) as f_err:
+        if input_data:
+            f_in.write(input_data.encode('utf-8'))
+            f_in.seek(0)
+
+        pid = os.posix_spawn(
+            argv[0],
+            argv,
+            dict(os.environ),
+            file_actions=[
+                (os.POSIX_SPAWN_DUP2, f_in.fileno(), 0),
+                (os.POSIX_SPAWN_DUP2, f_out.fileno(), 1),
+                (os.POSIX_SPAWN_DUP2, f_err.fileno(), 2),
+            ],
+        )
+        _, status, rusage = os.wait4(pid, 0)
+
+        f_out.seek(0)
+        stdout = f_out.read(max(STDOUT_CAP, len(expected_output) + 4096))
+        f_err.seek(0)
+        result['stderr'] = f_err.read(STDERR_CAP).decode('utf-8', errors='replace')
+
+    result['exitCode'] = os.waitstatus_to_exitcode(status)
+    result['memoryKb'] = rusage.ru_maxrss
+
+    # timeout --signal=KILL reports 137; a raw SIGKILL death shows as -9
+    if result['exitCode'] in (124, 137, -9):
+        result['timeoutOccurred'] = True
+    result['timeMs'] = elapsed_ms(start_time, rusage, result['timeoutOccurred'])
+
+    # Check if passed — raw bytes compare, no UTF-8 validation pass
+    if not result['timeoutOccurred'] and result['exitCode'] == 0:
+        result['passed'] = output_matches(stdout, expected_output)
+
+    # Check memory limit
+    if result['memoryKb'] > memory_kb:
+        result['memoryExceeded'] = True
+        result['passed'] = False
+
+    # Decoding is only paid for failing output that gets displayed;
+    # passing tests ship an empty stdout
+    if not result['passed']:
+        result['stdout'] = stdout[:100000].decode('utf-8', errors='replace')
+
+    return result
+
+
+# Warm interpreter reuse: one persistent_wrapper.py daemon per worker
+# runs every Python test in a single interpreter, so a suite pays
+# cold-start (imports, bytecode, dyld) once instead of per test. The
+# daemon is recycled after a fixed number of uses to bound state drift.
+# Opt-in via HARNESS_PERSISTENT=1, same switch the harness uses.
+_WRAPPER = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), 'harness', 'persistent_wrapper.py'
+)
+_WARM_ENABLED = os.environ.get('HARNESS_PERSISTENT') == '1' and os.path.exists(_WRAPPER)
+_MAX_WARM_USES = 100
+
+_warm_proc: Optional[subprocess.Popen] = None
+_warm_uses = 0
+
+
+def warm_eligible(command: List[str]) -> bool:
+    """The warm pool only understands plain `python3 <file>` invocations."""
+    return (
+        _WARM_ENABLED
+        and len(command) == 2
+        and command[0] in ('python', 'python3')
+    )
+
+
+def _reset_warm_interpreter():
+    global _warm_proc
+    if _warm_proc is not None:
+        _warm_proc.kill()
+        _warm_proc.wait()
+        _warm_proc = None
+
+
+def run_warm_test(
+    workspace: str,
+    command: List[str],
+    input_data: str,
+    expected_output: str,
+    test_id: str,
+    timeout_sec: int,
+    memory_kb: int,
+) -> Dict[str, Any]:
+    """Run one test through this worker's warm interpreter daemon.
+
+    Raises on any protocol failure so the caller can fall back to the
+    per-test spawn path.
+    """
+    global _warm_proc, _warm_uses
+
+    if (
+        _warm_proc is None
+        or _warm_proc.poll() is not None
+        or _warm_uses >= _MAX_WARM_USES
+    ):
+        _reset_warm_interpreter()
+        memory_bytes = memory_kb * 1024
+
+        def limit_memory():
+            # Only the address-space cap: an RLIMIT_CPU budget would be
+            # shared across every test the daemon serves.
+            resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+
+        _warm_proc = subprocess.Popen(
+            [command[0], '-u', _WRAPPER, command[1]],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+            preexec_fn=limit_memory,
+        )
+        _warm_uses = 0
+
+    result = {
+        'testId': test_id,
+        'passed': False,
+        'exitCode': -1,
+        'timeMs': 0,
+        'memoryKb': 0,
+        'timeoutOccurred': False,
+        'memoryExceeded': False,
+        'stdout': '',
+        'stderr': '',
+        'expectedOutput': expected_output,
+    }
+
+    start_time = time.perf_counter()
+    _warm_proc.stdin.write(json.dumps({'input': input_data}) + '\n')
+    _warm_proc.stdin.flush()
+
+    ready, _, _ = select.select([_warm_proc.stdout], [], [], timeout_sec + 1)
+    if not ready:
+        # A wedged daemon can't be reused; kill it and report a timeout.
+        # The next test respawns a fresh one.
+        _reset_warm_interpreter()
+        result['timeoutOccurred'] = True
+        result['exitCode'] = 124
+        result['timeMs'] = int((time.perf_counter() - start_time) * 1000)
+        return result
+
+    line = _warm_proc.stdout.readline()
+    if not line:
+        raise RuntimeError('warm interpreter exited unexpectedly')
+    response = json.loads(line)
+    _warm_uses += 1
+    result['timeMs'] = int((time.perf_counter() - start_time) * 1000)
+
+    if response.get('error'):
+        result['exitCode'] = 1
+        result['stderr'] = response['error'][:10000]
+    else:
+        result['exitCode'] = 0
+        result['stdout'] = response.get('stdout', '')[:100000]
+        result['passed'] = (result['stdout'].strip() == expected_output.strip())
+    return result
+
+
 def get_run_command(language: str, code_file: str) -> List[str]:
     """Get the command to run code for a given language."""
     if language in LANGUAGE_COMMANDS:
@@ -40,6 +367,112 @@ def get_run_command(language: str, code_file: str) -> List[str]:
     raise ValueError(f"Unsupported language: {language}")
 
 
+def drain_child(
+    process,
+    input_bytes: Optional[bytes],
+    timeout_sec: float,
+    stdout_cap: Optional[int] = None,
+    stderr_cap: Optional[int] = None,
+):
+    """Feed stdin and drain stdout/stderr through one event loop.
+
+    communicate() services the three pipes with a helper thread apiece;
+    a single nonblocking selector loop multiplexes them from this
+    thread, batching completions as they arrive instead of paying a
+    blocked thread (and its wakeups) per pipe per test.
+
+    Output is bounded: once a pipe's buffer reaches its cap, reading
+    stops and the child is killed, so a runaway printer costs at most
+    cap + one read chunk of memory instead of everything it can emit
+    before the deadline.
+
+    The child is reaped with wait4(2), so its rusage (peak RSS, CPU
+    time) comes back from the same syscall that collects the exit
+    status. Returns (stdout_bytes, stderr_bytes, timed_out, rusage).
+    On timeout the child is killed and whatever output it produced is
+    still collected.
+    """
+    sel = selectors.DefaultSelector()
+    pending = memoryview(input_bytes) if input_bytes else None
+    buffers = {}
+    caps = {}
+    timed_out = False
+
+    if process.stdin is not None:
+        if pending:
+            os.set_blocking(process.stdin.fileno(), False)
+            sel.register(process.stdin, selectors.EVENT_WRITE)
+        else:
+            process.stdin.close()
+    for pipe, cap in ((process.stdout, stdout_cap), (process.stderr, stderr_cap)):
+        if pipe is not None:
+            os.set_blocking(pipe.fileno(), False)
+            sel.register(pipe, selectors.EVENT_READ)
+            buffers[pipe] = bytearray()
+            caps[pipe] = cap
+
+    deadline = time.monotonic() + timeout_sec
+    while sel.get_map():
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            timed_out = True
+            break
+        events = sel.select(remaining)
+        if not events:
+            timed_out = True
+            break
+        for key, _ in events:
+            pipe = key.fileobj
+            if pipe is process.stdin:
+                try:
+                    n = os.write(pipe.fileno(), pending)
+                    pending = pending[n:]
+                except (BrokenPipeError, OSError):
+                    pending = None
+                if not pending:
+                    sel.unregister(pipe)
+                    pipe.close()
+            else:
+                chunk = os.read(pipe.fileno(), 65536)
+                if chunk:
+                    buf = buffers[pipe]
+                    buf.extend(chunk)
+                    cap = caps[pipe]
+                    if cap is not None and len(buf) >= cap:
+                        sel.unregister(pipe)
+                        pipe.close()
+                        process.kill()
+                else:
+                    sel.unregister(pipe)
+                    pipe.close()
+    sel.close()
+
+    if timed_out:
+        process.kill()
+    _, status, rusage = os.wait4(process.pid, 0)
+    # Tell Popen the child is already reaped so it never waits again
+    process.returncode = os.waitstatus_to_exitcode(status)
+
+    # Collect anything still buffered in pipes we did not reach EOF on
+    # (the child is dead, so reads terminate at EOF), still capped
+    for pipe, buf in buffers.items():
+        if not pipe.closed:
+            cap = caps[pipe]
+            try:
+                while cap is None or len(buf) < cap:
+                    chunk = os.read(pipe.fileno(), 65536)
+                    if not chunk:
+                        break
+                    buf.extend(chunk)
+            except OSError:
+                pass
+            pipe.close()
+    if process.stdin is not None and not process.stdin.closed:
+        process.stdin.close()
+
+    return bytes(buffers[process.stdout]), bytes(buffers[process.stderr]), timed_out, rusage
+
+
 def run_single_test(
     workspace: str,
     command: List[str],
@@ -65,42 +498,57 @@ def run_single_test(
     }
     
     start_time = time.perf_counter()
-    
+    stdout = b''
+    rusage = None
+
     try:
-        # Build command with timeout and resource limits
-        # Use unshare -n for network isolation if available
-        full_command = command
-        
+        # Build command with resource limits: prlimit prefix when
+        # available (no preexec_fn, fast spawn path), else fall back to
+        # setting rlimits in a pre-exec hook
+        if _prlimit_prefix:
+            full_command = [*_prlimit_prefix, *command]
+            preexec_fn = None
+        else:
+            full_command = command
+            preexec_fn = lambda: set_resource_limits(timeout_sec, memory_kb)
+
+        input_bytes = input_data.encode('utf-8') if input_data else None
+        stdin_fd = None
+        if input_bytes and _HAS_MEMFD and len(input_bytes) >= MEMFD_MIN_BYTES:
+            stdin_fd = make_stdin_fd(input_bytes)
+            input_bytes = None
+
         # Create process with resource limits
-        process = subprocess.Popen(
-            full_command,
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            cwd=workspace,
-            # Pre-exec function to set resource limits
-            preexec_fn=lambda: set_resource_limits(timeout_sec, memory_kb),
-        )
-        
-        # Communicate with timeout
         try:
-            stdout, stderr = process.communicate(
-                input=input_data.encode('utf-8') if input_data else None,
-                timeout=timeout_sec + 1  # Extra second for overhead
+            process = subprocess.Popen(
+                full_command,
+                stdin=subprocess.PIPE if stdin_fd is None else stdin_fd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                preexec_fn=preexec_fn,
             )
-            result['exitCode'] = process.returncode
-            result['stdout'] = stdout.decode('utf-8', errors='replace')[:100000]
-            result['stderr'] = stderr.decode('utf-8', errors='replace')[:10000]
-            
-        except subprocess.TimeoutExpired:
-            process.kill()
-            process.wait()
+        finally:
+            if stdin_fd is not None:
+                os.close(stdin_fd)
+
+        # Pump stdin/stdout/stderr from one event loop with a deadline
+        stdout, stderr, timed_out, rusage = drain_child(
+            process,
+            input_bytes,
+            timeout_sec + 1,  # Extra second for overhead
+            stdout_cap=max(STDOUT_CAP, len(expected_output) + 4096),
+            stderr_cap=STDERR_CAP,
+        )
+        # Peak RSS of this child, straight from the reaping wait4(2)
+        # (already KB on Linux)
+        result['memoryKb'] = rusage.ru_maxrss
+        if timed_out:
             result['timeoutOccurred'] = True
             result['exitCode'] = 124
-            stdout, stderr = process.communicate()
-            result['stdout'] = stdout.decode('utf-8', errors='replace')[:100000]
-            result['stderr'] = stderr.decode('utf-8', errors='replace')[:10000]
-    
+        else:
+            result['exitCode'] = process.returncode
+        result['stderr'] = stderr.decode('utf-8', errors='replace')[:10000]
+
     except MemoryError:
         result['memoryExceeded'] = True
         result['exitCode'] = 137
@@ -109,31 +557,23 @@ def run_single_test(
         result['stderr'] = str(e)
         result['exitCode'] = 1
     
-    end_time = time.perf_counter()
-    result['timeMs'] = int((end_time - start_time) * 1000)
-    
-    # Try to get memory usage from /proc (Linux only)
-    try:
-        with open(f'/proc/{os.getpid()}/status', 'r') as f:
-            for line in f:
-                if line.startswith('VmHWM:'):
-                    result['memoryKb'] = int(line.split()[1])
-                    break
-    except:
-        pass
-    
-    # Check if passed
+    result['timeMs'] = elapsed_ms(start_time, rusage, result['timeoutOccurred'])
+
+    # Check if passed — raw bytes compare, no UTF-8 validation pass
     if not result['timeoutOccurred'] and not result['memoryExceeded']:
         if result['exitCode'] == 0:
-            actual = result['stdout'].strip()
-            expected = expected_output.strip()
-            result['passed'] = (actual == expected)
-    
+            result['passed'] = output_matches(stdout, expected_output)
+
     # Check memory limit
     if result['memoryKb'] > memory_kb:
         result['memoryExceeded'] = True
         result['passed'] = False
-    
+
+    # Decoding is only paid for failing output that gets displayed;
+    # passing tests ship an empty stdout
+    if not result['passed']:
+        result['stdout'] = stdout[:100000].decode('utf-8', errors='replace')
+
     return result
 
 
@@ -170,8 +610,8 @@ def run_with_time_command(
     timeout_sec: int,
     memory_kb: int,
 ) -> Dict[str, Any]:
-    """Run test using /usr/bin/time -v for accurate memory measurement."""
-    
+    """Run test under `timeout`, reading resources from wait4 rusage."""
+
     result = {
         'testId': test_id,
         'passed': False,
@@ -184,97 +624,87 @@ def run_with_time_command(
         'stderr': '',
         'expectedOutput': expected_output,
     }
-    
-    # Create temp file for time output
-    with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.time') as tf:
-        time_output_file = tf.name
-    
+
+    stdout = b''
+
     try:
-        # Build command with timeout and time
+        # Build command with timeout
         # unshare -n: no network
         # timeout: time limit
-        # /usr/bin/time -v: measure resources
-        full_command = [
-            'timeout', '--signal=KILL', f'{timeout_sec}s',
-            '/usr/bin/time', '-v', '-o', time_output_file,
-        ] + command
-        
-        # Try to use unshare for network isolation
-        try:
-            subprocess.run(['unshare', '--help'], capture_output=True, check=True)
-            full_command = ['unshare', '-n'] + full_command
-        except:
-            pass
-        
+        # Peak RSS comes from the rusage returned by the reaping wait4,
+        # so no /usr/bin/time helper process or report file is needed.
+        full_command = [*_unshare_prefix, *_timeout_prefix, *command]
+
+        input_bytes = input_data.encode('utf-8') if input_data else None
+        stdin_fd = None
+        if input_bytes and _HAS_MEMFD and len(input_bytes) >= MEMFD_MIN_BYTES:
+            stdin_fd = make_stdin_fd(input_bytes)
+            input_bytes = None
+
         start_time = time.perf_counter()
-        
-        process = subprocess.Popen(
-            full_command,
-            stdin=subprocess.PIPE,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            cwd=workspace,
-        )
-        
-        stdout, stderr = process.communicate(
-            input=input_data.encode('utf-8') if input_data else None,
-            timeout=timeout_sec + 5
+
+        try:
+            process = subprocess.Popen(
+                full_command,
+                stdin=subprocess.PIPE if stdin_fd is None else stdin_fd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            )
+        finally:
+            if stdin_fd is not None:
+                os.close(stdin_fd)
+
+        stdout, stderr, timed_out, rusage = drain_child(
+            process,
+            input_bytes,
+            timeout_sec + 5,
+            stdout_cap=max(STDOUT_CAP, len(expected_output) + 4096),
+            stderr_cap=STDERR_CAP,
         )
-        
-        end_time = time.perf_counter()
-        
+
         result['exitCode'] = process.returncode
-        result['stdout'] = stdout.decode('utf-8', errors='replace')[:100000]
         result['stderr'] = stderr.decode('utf-8', errors='replace')[:10000]
-        result['timeMs'] = int((end_time - start_time) * 1000)
-        
-        # Check for timeout (exit code 124 or 137)
-        if process.returncode in (124, 137):
+        result['memoryKb'] = rusage.ru_maxrss
+
+        # Check for timeout (exit code 124 or 137, or harness deadline)
+        if timed_out or process.returncode in (124, 137):
             result['timeoutOccurred'] = True
-        
-        # Parse time output for memory
-        if os.path.exists(time_output_file):
-            with open(time_output_file, 'r') as f:
-                for line in f:
-                    if 'Maximum resident set size' in line:
-                        result['memoryKb'] = int(line.split(':')[1].strip())
-                        break
-        
-    except subprocess.TimeoutExpired:
-        process.kill()
-        result['timeoutOccurred'] = True
-        result['exitCode'] = 124
-        
+        result['timeMs'] = elapsed_ms(start_time, rusage, result['timeoutOccurred'])
+
     except Exception as e:
         result['stderr'] = str(e)
         result['exitCode'] = 1
-        
-    finally:
-        # Cleanup time output file
-        try:
-            os.unlink(time_output_file)
-        except:
-            pass
-    
-    # Check if passed
+
+    # Check if passed — raw bytes compare, no UTF-8 validation pass
     if not result['timeoutOccurred'] and result['exitCode'] == 0:
-        actual = result['stdout'].strip()
-        expected = expected_output.strip()
-        result['passed'] = (actual == expected)
-    
+        result['passed'] = output_matches(stdout, expected_output)
+
     # Check memory limit
     if result['memoryKb'] > memory_kb:
         result['memoryExceeded'] = True
         result['passed'] = False
-    
+
+    # Decoding is only paid for failing output that gets displayed;
+    # passing tests ship an empty stdout
+    if not result['passed']:
+        result['stdout'] = stdout[:100000].decode('utf-8', errors='replace')
+
     return result
 
 
+def dumps_result(result: Dict[str, Any]) -> str:
+    """Serialize one result dict (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(result).decode()
+    return json.dumps(result)
+
+
 def load_test_cases(test_cases_file: str) -> List[Dict[str, Any]]:
     """Load test cases from JSON file."""
-    with open(test_cases_file, 'r') as f:
-        data = json.load(f)
-    
+    with open(test_cases_file, 'rb') as f:
+        buf = f.read()
+    data = orjson.loads(buf) if orjson is not None else json.loads(buf)
+
     # Support both array and object with 'testCases' key
     if isinstance(data, list):
         return data
@@ -284,6 +714,88 @@ def load_test_cases(test_cases_file: str) -> List[Dict[str, Any]]:
         raise ValueError("Invalid test cases format")
 
 
+def run_test_case(
+    workspace: str,
+    command: List[str],
+    test_case: Dict[str, Any],
+    index: int,
+    timeout_sec: int,
+    memory_kb: int,
+) -> Dict[str, Any]:
+    """Run one test case dict (worker entry point for the process pool)."""
+    test_id = test_case.get('id', f'test-{index+1}')
+    input_data = test_case.get('input', '')
+    expected_output = test_case.get('expectedOutput', test_case.get('expected', ''))
+
+    # Compiled-binary fast path (posix_spawn); falls back on any error
+    if compiled_fast_eligible(command):
+        try:
+            return run_compiled_fast(
+                workspace, command, input_data, expected_output,
+                test_id, timeout_sec, memory_kb
+            )
+        except Exception:
+            pass
+
+    # Warm interpreter path; any protocol hiccup falls back to a spawn
+    if warm_eligible(command):
+        try:
+            return run_warm_test(
+                workspace, command, input_data, expected_output,
+                test_id, timeout_sec, memory_kb
+            )
+        except Exception:
+            _reset_warm_interpreter()
+
+    # Use the external-tool path if available, otherwise fall back to
+    # the Python-based one
+    if _HAS_TIME_BIN:
+        return run_with_time_command(
+            workspace, command, input_data, expected_output,
+            test_id, timeout_sec, memory_kb
+        )
+    return run_single_test(
+        workspace, command, input_data, expected_output,
+        test_id, timeout_sec, memory_kb
+    )
+
+
+# Invariant run configuration (command, workspace, limits), installed
+# once per worker by the pool initializer so each submission pickles
+# only its test case instead of repeating the same five arguments.
+_run_config: Optional[tuple] = None
+
+
+def init_worker(command: tuple, workspace: str, timeout_sec: int, memory_kb: int):
+    """Stash the frozen per-run arguments in this worker process."""
+    global _run_config
+    # One chdir per worker replaces a chdir (and its path resolution)
+    # inside every spawned child — Popen runs with cwd=None below
+    os.chdir(workspace)
+    install_command_prefixes(timeout_sec, memory_kb)
+    _run_config = (command, workspace, timeout_sec, memory_kb)
+
+
+# Result records travel from workers to the parent as plain tuples in
+# this field order — no per-record dict header or repeated key strings
+# on the pickle wire. Dicts are materialized only when a record is
+# about to be serialized for output.
+RESULT_FIELDS = (
+    'testId', 'passed', 'exitCode', 'timeMs', 'memoryKb',
+    'timeoutOccurred', 'memoryExceeded', 'stdout', 'stderr',
+    'expectedOutput',
+)
+
+
+def run_test_task(index: int, test_case: Dict[str, Any]) -> tuple:
+    """Pool task: run one test case against the worker's run config."""
+    command, workspace, timeout_sec, memory_kb = _run_config
+    result = run_test_case(
+        workspace, list(command), test_case, index, timeout_sec, memory_kb
+    )
+    return tuple(result[k] for k in RESULT_FIELDS)
+
+
 def main():
     if len(sys.argv) < 7:
         print("Usage: run_tests.py <workspace> <code_file> <language> <timeout_sec> <memory_kb> <test_cases_file>", file=sys.stderr)
@@ -299,36 +811,77 @@ def main():
     # Load test cases
     test_cases = load_test_cases(test_cases_file)
     
-    # Get run command
-    command = get_run_command(language, code_file)
+    # Get run command, frozen for the whole run
+    command = tuple(get_run_command(language, code_file))
     
-    # Run each test case
-    results = []
-    for i, test_case in enumerate(test_cases):
-        test_id = test_case.get('id', f'test-{i+1}')
-        input_data = test_case.get('input', '')
-        expected_output = test_case.get('expectedOutput', test_case.get('expected', ''))
-        
-        # Use /usr/bin/time if available, otherwise fall back to Python-based
-        if os.path.exists('/usr/bin/time'):
-            result = run_with_time_command(
-                workspace, command, input_data, expected_output,
-                test_id, timeout_sec, memory_kb
-            )
-        else:
-            result = run_single_test(
-                workspace, command, input_data, expected_output,
-                test_id, timeout_sec, memory_kb
+    # Run test cases across CPU cores. Each test is its own child
+    # process anyway, so overlapping them turns N*T sequential wall time
+    # into roughly N/cores.
+    #
+    # Results stream out as an incrementally written JSON array: each
+    # one is serialized and flushed as soon as every earlier index has
+    # reported, so the runner never holds the full result list and
+    # downstream consumers can pipeline. Skipped/cancelled slots are
+    # recorded as None and dropped from the output.
+    max_workers = min(len(test_cases), os.cpu_count() or 1)
+
+    out = sys.stdout
+    out.write('[')
+    ready: Dict[int, Optional[Dict[str, Any]]] = {}
+    next_index = 0
+    emitted = 0
+
+    def emit_contiguous():
+        """Flush the contiguous prefix of completed results, in order."""
+        nonlocal next_index, emitted
+        while next_index in ready:
+            result = ready.pop(next_index)
+            next_index += 1
+            if result is not None:
+                out.write((',' if emitted else '') + dumps_result(result))
+                emitted += 1
+        out.flush()
+
+    if max_workers <= 1:
+        # Pool workers get this setup from init_worker
+        os.chdir(workspace)
+        install_command_prefixes(timeout_sec, memory_kb)
+        for i, test_case in enumerate(test_cases):
+            result = run_test_case(
+                workspace, list(command), test_case, i, timeout_sec, memory_kb
             )
-        
-        results.append(result)
-        
-        # Optional: stop on first failure
-        if test_case.get('stopOnFailure') and not result['passed']:
-            break
-    
-    # Output JSON results
-    print(json.dumps(results))
+            ready[i] = result
+            emit_contiguous()
+            # Optional: stop on first failure
+            if test_case.get('stopOnFailure') and not result['passed']:
+                break
+    else:
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=init_worker,
+            initargs=(command, workspace, timeout_sec, memory_kb),
+        ) as executor:
+            futures = {
+                executor.submit(run_test_task, i, test_case): i
+                for i, test_case in enumerate(test_cases)
+            }
+            for future in as_completed(futures):
+                i = futures[future]
+                if future.cancelled():
+                    ready[i] = None
+                    emit_contiguous()
+                    continue
+                result = dict(zip(RESULT_FIELDS, future.result()))
+                ready[i] = result
+                emit_contiguous()
+                # Optional: stop on first failure — tests not yet started
+                # are cancelled; already-running ones still report.
+                if test_cases[i].get('stopOnFailure') and not result['passed']:
+                    for pending in futures:
+                        pending.cancel()
+
+    out.write(']\n')
+    out.flush()
 
 
 if __name__ == '__main__':